@@ -4,9 +4,11 @@ from flask_login import LoginManager
 from dictalchemy import DictableModel
 from sqlalchemy.ext.declarative import declarative_base
 from flask_apidoc import ApiDoc
+from .admission import AdmissionControl
 
 Base = declarative_base(cls=DictableModel)
 db = SQLAlchemy()
 io = FlaskIO()
 doc = ApiDoc()
 login_manager = LoginManager()
+admission = AdmissionControl()
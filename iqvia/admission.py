@@ -0,0 +1,138 @@
+import functools
+import threading
+from time import monotonic
+
+
+class Limiter(object):
+    """
+    A concurrency budget with a bounded wait queue.
+    At most `limit` callers are admitted at once, at most `queue_size` callers wait for a slot
+    and a waiting caller gives up after `queue_timeout` seconds.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> bool:
+        """
+        Tries to take a slot, waiting in the queue if the budget is exhausted.
+        :return bool: True if admitted, False if the caller has been shed.
+        """
+        with self._condition:
+            if self.active < self.limit and not self.waiting:
+                return self._admit()
+
+            if self.waiting >= self.queue_size:
+                self.shed += 1
+                return False
+
+            self.waiting += 1
+            try:
+                deadline = monotonic() + self.queue_timeout
+                while self.active >= self.limit:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        # Pass on a wake-up we may have consumed while timing out
+                        self._condition.notify()
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self.waiting -= 1
+            return self._admit()
+
+    def release(self):
+        """
+        Gives back a slot and wakes up the next waiting caller.
+        """
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    def stats(self) -> dict:
+        """
+        :return dict: the current state and counters of the limiter.
+        """
+        with self._condition:
+            return {'limit': self.limit,
+                    'active': self.active,
+                    'queue_size': self.queue_size,
+                    'queue_depth': self.waiting,
+                    'admitted': self.admitted,
+                    'shed': self.shed}
+
+    def _admit(self) -> bool:
+        self.active += 1
+        self.admitted += 1
+        return True
+
+
+class AdmissionControl(object):
+    """
+    Flask extension limiting the number of concurrent requests per budget ('read' or 'write').
+    The budgets are held in memory, so each worker process has its own.
+    Requests exceeding the budget and its queue get a fast 503 with a Retry-After header.
+    """
+
+    def __init__(self, app=None):
+        self.limiters = {}
+        self.retry_after = 1
+
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Creates the limiters from the application configuration.
+        :param app: The Flask application.
+        """
+        config = app.config
+        queue_size = config['ADMISSION_QUEUE_SIZE']
+        queue_timeout = config['ADMISSION_QUEUE_TIMEOUT']
+
+        self.limiters = {
+            'read': Limiter(config['ADMISSION_READ_LIMIT'], queue_size, queue_timeout),
+            'write': Limiter(config['ADMISSION_WRITE_LIMIT'], queue_size, queue_timeout),
+        }
+        self.retry_after = config['ADMISSION_RETRY_AFTER']
+
+    def limit(self, budget: str):
+        """
+        A decorator admitting the calls of the view within the given budget.
+        It must be the outermost decorator after the route so shed requests skip parsing and marshalling.
+        :param str budget: The name of the budget, 'read' or 'write'.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                limiter = self.limiters[budget]
+                if not limiter.acquire():
+                    return self.service_unavailable()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    limiter.release()
+            return wrapper
+        return decorator
+
+    def service_unavailable(self):
+        """
+        :return tuple: the 503 response returned to a shed request.
+        """
+        return ({'errors': [{'message': 'Sorry, the server is too busy to handle your request, '
+                                        'please retry later'}]},
+                503,
+                {'Retry-After': str(self.retry_after)})
+
+    def stats(self) -> dict:
+        """
+        :return dict: the state and counters of every budget.
+        """
+        return {budget: limiter.stats() for budget, limiter in self.limiters.items()}
@@ -2,7 +2,7 @@ import logging
 import os
 from flask import Flask
 from werkzeug.utils import import_string
-from . import config, db, io, doc, login_manager
+from . import config, db, io, doc, login_manager, admission
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +23,12 @@ def create_app(environment):
     app.config.from_object(config_obj)
     app.url_map.strict_slashes = False
     app.add_url_rule('/', 'home', home)
+    app.add_url_rule('/admission', 'admission', admission_stats)
     register_blueprints(app)
     doc.init_app(app)
     db.init_app(app)
     io.init_app(app)
+    admission.init_app(app)
 
     return app
 
@@ -35,6 +37,11 @@ def home():
     return 'Welcome on the Iqvia API ;-)'
 
 
+def admission_stats():
+    """Exposes the queue depth and shed counts of the admission control budgets."""
+    return admission.stats()
+
+
 def register_blueprints(app):
     root_folder = 'iqvia'
 
@@ -1,17 +1,27 @@
+class Base(object):
+    # Concurrent requests allowed on the database per worker process, SQLite serializes the writes anyway.
+    # The budgets are not shared between processes: divide the database-wide budget by the worker count.
+    ADMISSION_READ_LIMIT = 8
+    ADMISSION_WRITE_LIMIT = 2
+    # Requests waiting for a slot in each worker process before being shed with a 503
+    ADMISSION_QUEUE_SIZE = 16
+    ADMISSION_QUEUE_TIMEOUT = 2.0
+    # Seconds a shed client is told to wait before retrying
+    ADMISSION_RETRY_AFTER = 2
 
 
-class Testing(object):
+class Testing(Base):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///iqvia.db'
 
 
-class Development(object):
+class Development(Base):
     DEBUG = True
     # Use development database here
     SQLALCHEMY_DATABASE_URI = 'sqlite:///iqvia.db'
 
 
-class Production(object):
+class Production(Base):
     # We don't want the debug logs in production
     DEBUG = False
     # Use production database here
@@ -0,0 +1,15 @@
+from flask_script import Command
+from .models import ContactDomainCount
+from .services import rebuild_domain_counts
+from .. import db
+
+
+class RebuildContactStats(Command):
+    """
+    Creates the contact counts table if missing, then rebuilds the counts per email domain from the contacts table.
+    """
+
+    def run(self):
+        ContactDomainCount.__table__.create(db.engine, checkfirst=True)
+        counts = rebuild_domain_counts()
+        print('Rebuilt the counts of {} contacts over {} domains'.format(sum(counts.values()), len(counts)))
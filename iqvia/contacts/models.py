@@ -1,5 +1,5 @@
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Integer, String
 from .. import db
 
 
@@ -11,3 +11,13 @@ class Contact(db.Model):
     surname = Column(String(50), nullable=False)
     username = Column(String(32), nullable=False, unique=True)
     email = Column(String(128), nullable=False, unique=True)
+
+
+class ContactDomainCount(db.Model):
+    """
+    Number of contacts per email domain, maintained along with the contacts.
+    """
+    __tablename__ = 'contact_domain_counts'
+
+    domain = Column(String(128), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,9 @@
-from flask_io import fields, Schema, post_load, validate
+from flask_io import fields, Schema, ValidationError, post_load, validate, validates_schema
 from .models import Contact
-from .services import validate_username
+from .services import validate_username, validate_uuid
+
+# Keeps a lookup within a single IN query under the SQLite bound parameters limit (999)
+MAX_LOOKUP_IDENTIFIERS = 500
 
 
 class ContactSchema(Schema):
@@ -21,3 +24,27 @@ class ContactSchema(Schema):
         if self.partial:
             return data
         return Contact(**data)
+
+
+class ContactLookupSchema(Schema):
+    """
+    deserialization-validation class for a batched lookup of contacts by usernames and/or ids.
+    The ids are kept as sent so the response is keyed by the requested identifiers.
+    """
+    usernames = fields.List(fields.String(), missing=list)
+    ids = fields.List(fields.String(validate=validate_uuid,
+                                    error_messages={'validator_failed': 'Not a valid UUID.'}), missing=list)
+
+    @validates_schema
+    def _validate_identifiers(self, data):
+        count = len(set(data.get('usernames', []))) + len(set(data.get('ids', [])))
+        if not count:
+            raise ValidationError('Sorry, at least one username or id must be given.')
+        if count > MAX_LOOKUP_IDENTIFIERS:
+            raise ValidationError('Sorry, you cannot look up more than {} contacts '
+                                  'at once.'.format(MAX_LOOKUP_IDENTIFIERS))
+
+    @post_load
+    def _post_load(self, data):
+        # Removes the duplicated identifiers, keeping the requested order
+        return {'usernames': list(dict.fromkeys(data['usernames'])), 'ids': list(dict.fromkeys(data['ids']))}
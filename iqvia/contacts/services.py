@@ -1,7 +1,13 @@
-from sqlalchemy import func
-from .models import Contact
+from collections import Counter
+from uuid import UUID
+from sqlalchemy import func, or_
+from .models import Contact, ContactDomainCount
+from .. import db
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 
 def validate_username(username: str) -> bool:
     """
@@ -13,6 +19,20 @@ def validate_username(username: str) -> bool:
     return True if re.match("^([a-zA-Z0-9]|\.){6,32}$", username) else False
 
 
+def validate_uuid(value: str) -> bool:
+    """
+    Checking that the value is a valid UUID, in any of the forms accepted by uuid.UUID.
+    :param str value: the value to be validated.
+    e.g: '7E8377AF-BDC3-4B9E-A491-2D9DDFF3253F'
+    :return bool: True if valid UUID.
+    """
+    try:
+        UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
+
+
 def does_contact_username_exist(username: str):
     """
     True if a contact already exists with this username.
@@ -31,3 +51,89 @@ def does_contact_email_exist(email: str):
     :return bool: True if a contact with this email does exist.
     """
     return Contact.query.filter(func.lower(Contact.email) == func.lower(str(email))).scalar() is not None
+
+
+def find_contacts(usernames: list, ids: list) -> dict:
+    """
+    Resolves the contacts with the given usernames or ids in a single query.
+    Only the non-empty lists are queried, so each IN condition can use its index.
+    The ids are normalized for the query but the contacts are keyed by the ids as requested.
+    :param list usernames: The usernames to look up. e.g: ['username1234']
+    :param list ids: The ids to look up. e.g: ['7E8377AF-BDC3-4B9E-A491-2D9DDFF3253F']
+    :return dict: The contacts found, keyed by the requested username and id in 'usernames' and 'ids'.
+    """
+    normalized_ids = {contact_id: str(UUID(contact_id)) for contact_id in ids}
+    criteria = []
+    if usernames:
+        criteria.append(Contact.username.in_(set(usernames)))
+    if normalized_ids:
+        criteria.append(Contact.id.in_(set(normalized_ids.values())))
+    contacts = Contact.query.filter(or_(*criteria)).all() if criteria else []
+
+    by_username = {contact.username: contact for contact in contacts}
+    by_id = {contact.id: contact for contact in contacts}
+    return {'usernames': {username: by_username[username] for username in usernames if username in by_username},
+            'ids': {contact_id: by_id[normalized_id] for contact_id, normalized_id in normalized_ids.items()
+                    if normalized_id in by_id}}
+
+
+def get_email_domain(email: str) -> str:
+    """
+    The lower-cased domain of an email address.
+    :param str email: The email to extract the domain from.
+    e.g: 'guyemailaddress@Gmail.com'
+    :return str: The domain of the email. e.g: 'gmail.com'
+    """
+    return str(email).rpartition('@')[2].lower()
+
+
+def update_domain_count(email: str, delta: int):
+    """
+    Adds delta to the contact count of the email domain, in the current transaction.
+    :param str email: The email of the contact added or removed.
+    :param int delta: 1 when a contact is added, -1 when removed.
+    """
+    domain = get_email_domain(email)
+    updated = ContactDomainCount.query.filter(ContactDomainCount.domain == domain) \
+        .update({ContactDomainCount.count: ContactDomainCount.count + delta}, synchronize_session=False)
+    if not updated:
+        db.session.add(ContactDomainCount(domain=domain, count=delta))
+
+
+def move_domain_count(old_email: str, new_email: str):
+    """
+    Moves a contact from the count of its old email domain to the count of the new one.
+    :param str old_email: The current email of the contact.
+    :param str new_email: The email the contact is updated with.
+    """
+    if get_email_domain(old_email) != get_email_domain(new_email):
+        update_domain_count(old_email, -1)
+        update_domain_count(new_email, 1)
+
+
+def get_domain_counts() -> dict:
+    """
+    The number of contacts per email domain, read from the maintained counters.
+    Negative counters are kept and logged: they mean the counters drifted and must be rebuilt.
+    :return dict: The counts keyed by domain. e.g: {'gmail.com': 2}
+    """
+    counts = dict(ContactDomainCount.query.with_entities(ContactDomainCount.domain, ContactDomainCount.count)
+                  .filter(ContactDomainCount.count != 0).all())
+    drifted = {domain: count for domain, count in counts.items() if count < 0}
+    if drifted:
+        logger.warning('Negative contact counts %s, run `python manage.py rebuild_stats`', drifted)
+    return counts
+
+
+def rebuild_domain_counts() -> dict:
+    """
+    Recomputes the counts per email domain from the contacts table to repair any drift.
+    The counters are deleted before the contacts are read: the DELETE takes the write lock,
+    so no contact change can commit between the read and the re-insert.
+    :return dict: The rebuilt counts keyed by domain.
+    """
+    ContactDomainCount.query.delete(synchronize_session=False)
+    counts = Counter(get_email_domain(email) for email, in db.session.query(Contact.email))
+    db.session.add_all(ContactDomainCount(domain=domain, count=count) for domain, count in counts.items())
+    db.session.commit()
+    return dict(counts)
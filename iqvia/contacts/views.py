@@ -1,14 +1,16 @@
 from flask import Blueprint
 from uuid import uuid4
-from .services import does_contact_username_exist, does_contact_email_exist
-from .schemas import ContactSchema
+from .services import does_contact_username_exist, does_contact_email_exist, update_domain_count, \
+    move_domain_count, get_domain_counts, find_contacts
+from .schemas import ContactSchema, ContactLookupSchema
 from .models import Contact
-from .. import db, io
+from .. import db, io, admission
 
 app = Blueprint('contacts', __name__, url_prefix='/contacts')
 
 
 @app.route('/', methods=['POST'])
+@admission.limit('write')
 @io.from_body('contact', ContactSchema)
 @io.marshal_with(ContactSchema)
 def add_contact(contact):
@@ -39,12 +41,14 @@ def add_contact(contact):
         return io.bad_request('Sorry, the email {} of the contact you try '
                               'to add already exists'.format(contact.email))
     db.session.add(contact)
+    update_domain_count(contact.email, 1)
     db.session.commit()
 
     return contact
 
 
 @app.route('/', methods=['GET'])
+@admission.limit('read')
 @io.marshal_with(ContactSchema, envelope='contacts')
 def get_contacts():
     """
@@ -63,7 +67,53 @@ def get_contacts():
     return Contact.query.all()
 
 
+@app.route('/lookup', methods=['POST'])
+@admission.limit('read')
+@io.from_body('lookup', ContactLookupSchema)
+def lookup_contacts(lookup):
+    """
+    @api {post} /contacts/lookup Gets a batch of contacts
+    @apiDescription Gets up to 500 contacts by usernames and/or ids in a single request
+    @apiName lookup_contacts
+    @apiGroup Contacts
+
+    @apiParam (Body) {String[]}          [usernames]          The usernames of the contacts.
+    @apiParam (Body) {UUID[]}            [ids]                The IDs of the contacts.
+
+    @apiSuccess {Object}                 contacts             The contacts found.
+    @apiSuccess {Object}                 contacts.usernames   The contacts found, keyed by requested username.
+    @apiSuccess {Object}                 contacts.ids         The contacts found, keyed by requested ID.
+    @apiSuccess {Object}                 missing              The requested identifiers with no contact.
+    @apiSuccess {String[]}               missing.usernames    The requested usernames with no contact.
+    @apiSuccess {String[]}               missing.ids          The requested IDs with no contact.
+    """
+    contacts = find_contacts(lookup['usernames'], lookup['ids'])
+    schema = ContactSchema()
+
+    return {'contacts': {kind: {identifier: schema.dump(contact).data for identifier, contact in found.items()}
+                         for kind, found in contacts.items()},
+            'missing': {kind: [identifier for identifier in lookup[kind] if identifier not in contacts[kind]]
+                        for kind in contacts}}
+
+
+@app.route('/stats', methods=['GET'])
+@admission.limit('read')
+def get_contacts_stats():
+    """
+    @api {get} /contacts/stats Gets the contacts statistics
+    @apiDescription Gets the number of contacts, in total and per email domain
+    @apiName get_contacts_stats
+    @apiGroup Contacts
+
+    @apiSuccess {Number}                 total                The number of contacts.
+    @apiSuccess {Object}                 domains              The number of contacts keyed by email domain.
+    """
+    domains = get_domain_counts()
+    return {'total': sum(domains.values()), 'domains': domains}
+
+
 @app.route('/<string:username>', methods=['GET'])
+@admission.limit('read')
 @io.marshal_with(ContactSchema)
 def get_contact_by_username(username):
     """
@@ -87,6 +137,7 @@ def get_contact_by_username(username):
 
 
 @app.route('/<uuid:contact_id>', methods=['DELETE'])
+@admission.limit('write')
 def delete_contact(contact_id):
     """
     @api {delete} /contacts/<contact_id> Deletes a contact
@@ -101,10 +152,12 @@ def delete_contact(contact_id):
         return io.bad_request('Sorry, the contact {} you try to delete does not exist'.format(contact_id))
 
     db.session.delete(contact)
+    update_domain_count(contact.email, -1)
     db.session.commit()
 
 
 @app.route('/<uuid:contact_id>', methods=['PATCH', 'PUT', 'POST'])
+@admission.limit('write')
 @io.from_body('contact_data', ContactSchema(partial=True))
 @io.marshal_with(ContactSchema())
 def update_contact(contact_id, contact_data):
@@ -146,6 +199,7 @@ def update_contact(contact_id, contact_data):
     if 'username' in contact_data:
         contact.username = contact_data['username']
     if 'email' in contact_data:
+        move_domain_count(contact.email, contact_data['email'])
         contact.email = contact_data['email']
 
     db.session.commit()
@@ -1,7 +1,7 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 import uuid
 
 SQLALCHEMY_DATABASE_URI = 'sqlite:///iqvia.db'
@@ -24,5 +24,12 @@ class Contact(UserMixin, db.Model):
     email = db.Column(String(128), nullable=False, unique=True)
 
 
+class ContactDomainCount(db.Model):
+    __tablename__ = 'contact_domain_counts'
+
+    domain = db.Column(String(128), primary_key=True)
+    count = db.Column(Integer, nullable=False, default=0)
+
+
 with app.app_context():
     db.create_all()
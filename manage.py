@@ -2,11 +2,13 @@ from iqvia.application import create_app
 from flask_script import Manager
 from flask_apidoc.commands import GenerateApiDoc
 from flask_script import Server
+from iqvia.contacts.commands import RebuildContactStats
 
 
 manager = Manager(create_app('testing'), False)
 manager.add_command('runserver', Server('0.0.0.0', 7000))
 manager.add_command('apidoc', GenerateApiDoc('iqvia/', 'iqvia/static/docs/'))
+manager.add_command('rebuild_stats', RebuildContactStats())
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
-from iqvia.contacts.services import validate_username, does_contact_username_exist
-from unittest.mock import Mock
+from iqvia.contacts.services import validate_username, validate_uuid, does_contact_username_exist, get_email_domain, \
+    update_domain_count, move_domain_count, find_contacts, get_domain_counts, rebuild_domain_counts
+from iqvia.contacts.models import Contact
+from unittest.mock import Mock, MagicMock, call
 
 
 def test_valid_usernames():
@@ -41,3 +43,158 @@ def test_contact_doesnt_exists(monkeypatch):
     monkeypatch.setattr('iqvia.contacts.services.Contact',
                         Mock(query=Mock(filter=Mock(return_value=Mock(scalar=Mock(return_value=None))))))
     assert does_contact_username_exist('username') is False
+
+
+def test_find_contacts(monkeypatch):
+    """
+    Testing the contacts are found by a single username IN / id IN query
+    and keyed by the username or id as requested.
+    :return:
+    """
+    contact_1 = Contact(id='7e8377af-bdc3-4b9e-a491-2d9ddff3253f', username='testusername1234')
+    contact_2 = Contact(id='6e8377af-bdc3-4b9e-a491-2d9ddff3253f', username='testusername4567')
+    query_mock = Mock(filter=Mock(return_value=Mock(all=Mock(return_value=[contact_1, contact_2]))))
+    monkeypatch.setattr('iqvia.contacts.services.Contact',
+                        Mock(query=query_mock, username=Contact.username, id=Contact.id))
+
+    assert find_contacts(['testusername1234', 'wrongusername'],
+                         ['6E8377AF-BDC3-4B9E-A491-2D9DDFF3253F']) == {
+        'usernames': {'testusername1234': contact_1},
+        'ids': {'6E8377AF-BDC3-4B9E-A491-2D9DDFF3253F': contact_2}}
+    assert query_mock.filter.call_count == 1
+
+    criterion = query_mock.filter.call_args[0][0].compile()
+    assert str(criterion) == 'contacts.username IN (:username_1, :username_2) OR contacts.id IN (:id_1)'
+    assert sorted(criterion.params.values()) == ['6e8377af-bdc3-4b9e-a491-2d9ddff3253f',
+                                                 'testusername1234', 'wrongusername']
+
+
+def test_find_contacts_by_ids_only(monkeypatch):
+    """
+    Testing a lookup by ids only queries the indexed id column, without an empty username IN condition.
+    :return:
+    """
+    contact = Contact(id='7e8377af-bdc3-4b9e-a491-2d9ddff3253f', username='testusername1234')
+    query_mock = Mock(filter=Mock(return_value=Mock(all=Mock(return_value=[contact]))))
+    monkeypatch.setattr('iqvia.contacts.services.Contact',
+                        Mock(query=query_mock, username=Contact.username, id=Contact.id))
+
+    assert find_contacts([], ['7e8377af-bdc3-4b9e-a491-2d9ddff3253f']) == {
+        'usernames': {},
+        'ids': {'7e8377af-bdc3-4b9e-a491-2d9ddff3253f': contact}}
+
+    criterion = query_mock.filter.call_args[0][0].compile()
+    assert str(criterion) == 'contacts.id IN (:id_1)'
+
+
+def test_validate_uuid():
+    """
+    Testing valid and invalid UUIDs.
+    :return:
+    """
+    assert validate_uuid('7E8377AF-BDC3-4B9E-A491-2D9DDFF3253F') is True
+    assert validate_uuid('7e8377afbdc34b9ea4912d9ddff3253f') is True
+    assert validate_uuid('7e8377af-bdc3-4b9e-a491-2d9ddff3253g') is False
+
+
+def test_get_email_domain():
+    """
+    Testing the domain is extracted lower-cased from the email.
+    :return:
+    """
+    assert get_email_domain('guyemailaddress@Gmail.com') == 'gmail.com'
+
+
+def test_update_domain_count_existing_domain(monkeypatch):
+    """
+    Testing the counter of a known domain is updated in place.
+    n.b: 1 row updated, no counter added.
+    :return:
+    """
+    database_mock = Mock()
+    monkeypatch.setattr('iqvia.contacts.services.ContactDomainCount',
+                        MagicMock(query=Mock(filter=Mock(return_value=Mock(update=Mock(return_value=1))))))
+    monkeypatch.setattr('iqvia.contacts.services.db.session.add', database_mock)
+
+    update_domain_count('username@gmail.com', 1)
+    assert database_mock.call_count == 0
+
+
+def test_update_domain_count_new_domain(monkeypatch):
+    """
+    Testing a counter is added for an unknown domain.
+    n.b: 0 row updated, a counter is added.
+    :return:
+    """
+    database_mock = Mock()
+    domain_count_mock = MagicMock(query=Mock(filter=Mock(return_value=Mock(update=Mock(return_value=0)))))
+    monkeypatch.setattr('iqvia.contacts.services.ContactDomainCount', domain_count_mock)
+    monkeypatch.setattr('iqvia.contacts.services.db.session.add', database_mock)
+
+    update_domain_count('username@gmail.com', 1)
+    assert database_mock.call_count == 1
+    domain_count_mock.assert_called_once_with(domain='gmail.com', count=1)
+
+
+def test_move_domain_count(monkeypatch):
+    """
+    Testing the counters are untouched when the email changes within the same domain
+    and moved when it changes to another domain.
+    :return:
+    """
+    domain_count_mock = Mock()
+    monkeypatch.setattr('iqvia.contacts.services.update_domain_count', domain_count_mock)
+
+    move_domain_count('username@gmail.com', 'other@GMAIL.com')
+    assert domain_count_mock.call_count == 0
+
+    move_domain_count('username@gmail.com', 'username@iqvia.com')
+    assert domain_count_mock.call_count == 2
+
+
+def test_rebuild_domain_counts(monkeypatch):
+    """
+    Testing the counters are deleted and re-inserted grouped by lower-cased domain.
+    :return:
+    """
+    session_mock = Mock(query=Mock(return_value=[('username@gmail.com',), ('other@GMAIL.com',),
+                                                 ('username@iqvia.com',)]))
+    domain_count_mock = MagicMock()
+    monkeypatch.setattr('iqvia.contacts.services.db.session', session_mock)
+    monkeypatch.setattr('iqvia.contacts.services.ContactDomainCount', domain_count_mock)
+
+    assert rebuild_domain_counts() == {'gmail.com': 2, 'iqvia.com': 1}
+
+    assert domain_count_mock.query.delete.call_count == 1
+    assert list(session_mock.add_all.call_args[0][0]) == [domain_count_mock.return_value] * 2
+    assert domain_count_mock.call_args_list == [call(domain='gmail.com', count=2), call(domain='iqvia.com', count=1)]
+    assert session_mock.commit.call_count == 1
+
+
+def test_rebuild_domain_counts_deletes_before_reading(monkeypatch):
+    """
+    Testing the counters are deleted before the contacts are read, so the write lock is held during the rebuild.
+    :return:
+    """
+    manager_mock = Mock()
+    manager_mock.session.query.return_value = []
+    monkeypatch.setattr('iqvia.contacts.services.db.session', manager_mock.session)
+    monkeypatch.setattr('iqvia.contacts.services.ContactDomainCount', manager_mock.counts)
+
+    rebuild_domain_counts()
+
+    calls = [name for name, args, kwargs in manager_mock.mock_calls]
+    assert calls.index('counts.query.delete') < calls.index('session.query')
+
+
+def test_get_domain_counts_keeps_negative_counts(monkeypatch, caplog):
+    """
+    Testing a negative counter is returned and logged instead of hidden.
+    :return:
+    """
+    query_mock = Mock(with_entities=Mock(return_value=Mock(filter=Mock(return_value=Mock(
+        all=Mock(return_value=[('gmail.com', 2), ('iqvia.com', -1)]))))))
+    monkeypatch.setattr('iqvia.contacts.services.ContactDomainCount', MagicMock(query=query_mock))
+
+    assert get_domain_counts() == {'gmail.com': 2, 'iqvia.com': -1}
+    assert 'rebuild_stats' in caplog.text
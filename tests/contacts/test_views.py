@@ -21,6 +21,8 @@ def test_add_contact_ok(monkeypatch):
     monkeypatch.setattr('iqvia.contacts.views.db.session.commit', database_mock)
     monkeypatch.setattr('iqvia.contacts.views.does_contact_username_exist', Mock(return_value=False))
     monkeypatch.setattr('iqvia.contacts.views.does_contact_email_exist', Mock(return_value=False))
+    domain_count_mock = Mock()
+    monkeypatch.setattr('iqvia.contacts.views.update_domain_count', domain_count_mock)
     status_code, response_data = post('contacts/', test_data)
 
     assert response_data == {'id': '7e8377af-bdc3-4b9e-a491-2d9ddff3253f',
@@ -30,6 +32,7 @@ def test_add_contact_ok(monkeypatch):
                              'email': 'testemail2@gmail.com'}
     assert status_code == 200
     assert database_mock.call_count == 2
+    domain_count_mock.assert_called_once_with('testemail2@gmail.com', 1)
 
 
 def test_add_contact_nok_username_already_exists(monkeypatch):
@@ -101,6 +104,119 @@ def test_get_contacts_ok(monkeypatch):
     assert status_code == 200
 
 
+def test_lookup_contacts_ok(monkeypatch):
+    """
+    Testing a valid batched lookup: contacts found keyed by identifier, the others listed as missing.
+    :param monkeypatch: a monkeypatching instance.
+    :return:
+    """
+    contact = Contact(id='7e8377af-bdc3-4b9e-a491-2d9ddff3253f', first_name='testfirstname',
+                      surname='testsurname', username='testusername1234', email='testemail1@gmail.com')
+    find_contacts_mock = Mock(return_value={'usernames': {'testusername1234': contact}, 'ids': {}})
+    monkeypatch.setattr('iqvia.contacts.views.find_contacts', find_contacts_mock)
+
+    status_code, response_data = post('contacts/lookup', {'usernames': ['testusername1234', 'wrongusername'],
+                                                          'ids': ['6e8377af-bdc3-4b9e-a491-2d9ddff3253f']})
+
+    assert response_data == {'contacts': {'usernames': {'testusername1234': {
+                                              'id': '7e8377af-bdc3-4b9e-a491-2d9ddff3253f',
+                                              'first_name': 'testfirstname',
+                                              'surname': 'testsurname',
+                                              'username': 'testusername1234',
+                                              'email': 'testemail1@gmail.com'}},
+                                          'ids': {}},
+                             'missing': {'usernames': ['wrongusername'],
+                                         'ids': ['6e8377af-bdc3-4b9e-a491-2d9ddff3253f']}}
+    assert status_code == 200
+    assert find_contacts_mock.call_count == 1
+
+
+def test_lookup_contacts_ok_keyed_by_requested_id(monkeypatch):
+    """
+    Testing a valid batched lookup by non-lowercase ids: the contacts are keyed by the ids as sent
+    and a repeated missing id is listed once.
+    :param monkeypatch: a monkeypatching instance.
+    :return:
+    """
+    contact = Contact(id='7e8377af-bdc3-4b9e-a491-2d9ddff3253f', first_name='testfirstname',
+                      surname='testsurname', username='testusername1234', email='testemail1@gmail.com')
+    monkeypatch.setattr('iqvia.contacts.services.Contact',
+                        Mock(query=Mock(filter=Mock(return_value=Mock(all=Mock(return_value=[contact])))),
+                             username=Contact.username, id=Contact.id))
+
+    status_code, response_data = post('contacts/lookup', {'ids': ['7E8377AF-BDC3-4B9E-A491-2D9DDFF3253F',
+                                                                  '6e8377afbdc34b9ea4912d9ddff3253f',
+                                                                  '6e8377afbdc34b9ea4912d9ddff3253f']})
+
+    assert response_data == {'contacts': {'usernames': {},
+                                          'ids': {'7E8377AF-BDC3-4B9E-A491-2D9DDFF3253F': {
+                                              'id': '7e8377af-bdc3-4b9e-a491-2d9ddff3253f',
+                                              'first_name': 'testfirstname',
+                                              'surname': 'testsurname',
+                                              'username': 'testusername1234',
+                                              'email': 'testemail1@gmail.com'}}},
+                             'missing': {'usernames': [], 'ids': ['6e8377afbdc34b9ea4912d9ddff3253f']}}
+    assert status_code == 200
+
+
+def test_lookup_contacts_ok_same_identifier_as_username_and_id(monkeypatch):
+    """
+    Testing a valid batched lookup of a hex string sent both as username and id:
+    the username match and the missing id are reported separately.
+    :param monkeypatch: a monkeypatching instance.
+    :return:
+    """
+    contact = Contact(id='6e8377af-bdc3-4b9e-a491-2d9ddff3253f', first_name='testfirstname',
+                      surname='testsurname', username='7e8377afbdc34b9ea4912d9ddff3253f', email='testemail1@gmail.com')
+    monkeypatch.setattr('iqvia.contacts.services.Contact',
+                        Mock(query=Mock(filter=Mock(return_value=Mock(all=Mock(return_value=[contact])))),
+                             username=Contact.username, id=Contact.id))
+
+    status_code, response_data = post('contacts/lookup', {'usernames': ['7e8377afbdc34b9ea4912d9ddff3253f'],
+                                                          'ids': ['7e8377afbdc34b9ea4912d9ddff3253f']})
+
+    assert response_data == {'contacts': {'usernames': {'7e8377afbdc34b9ea4912d9ddff3253f': {
+                                              'id': '6e8377af-bdc3-4b9e-a491-2d9ddff3253f',
+                                              'first_name': 'testfirstname',
+                                              'surname': 'testsurname',
+                                              'username': '7e8377afbdc34b9ea4912d9ddff3253f',
+                                              'email': 'testemail1@gmail.com'}},
+                                          'ids': {}},
+                             'missing': {'usernames': [], 'ids': ['7e8377afbdc34b9ea4912d9ddff3253f']}}
+    assert status_code == 200
+
+
+def test_lookup_contacts_nok_too_many_identifiers(monkeypatch):
+    """
+    Testing an invalid batched lookup: more identifiers than allowed.
+    :param monkeypatch: a monkeypatching instance.
+    :return:
+    """
+    find_contacts_mock = Mock()
+    monkeypatch.setattr('iqvia.contacts.views.find_contacts', find_contacts_mock)
+
+    status_code, response_data = post('contacts/lookup', {'usernames': ['testusername{}'.format(number)
+                                                                        for number in range(501)]})
+
+    assert response_data == {'errors': [{'field': '_schema', 'location': 'body',
+                                         'message': 'Sorry, you cannot look up more than 500 contacts at once.'}]}
+    assert status_code == 400
+    assert find_contacts_mock.call_count == 0
+
+
+def test_get_contacts_stats_ok(monkeypatch):
+    """
+    Testing a valid contacts statistics fetching: counts read from the domain counters.
+    :param monkeypatch: a monkeypatching instance.
+    :return:
+    """
+    monkeypatch.setattr('iqvia.contacts.views.get_domain_counts', Mock(return_value={'gmail.com': 2, 'iqvia.com': 1}))
+
+    status_code, response_data = get('contacts/stats')
+    assert response_data == {'total': 3, 'domains': {'gmail.com': 2, 'iqvia.com': 1}}
+    assert status_code == 200
+
+
 def test_get_contact_by_username_ok(monkeypatch):
     """
     Testing a valid get by username scenario.
@@ -150,11 +266,14 @@ def test_delete_contacts_ok(monkeypatch):
                         Mock(query=Mock(filter=Mock(return_value=Mock(first=Mock(return_value=contact))))))
     monkeypatch.setattr('iqvia.contacts.views.db.session.delete', database_mock)
     monkeypatch.setattr('iqvia.contacts.views.db.session.commit', database_mock)
+    domain_count_mock = Mock()
+    monkeypatch.setattr('iqvia.contacts.views.update_domain_count', domain_count_mock)
 
     status_code = delete('contacts/7e8377af-bdc3-4b9e-a491-2d9ddff3253f')
 
     assert database_mock.call_count == 2
     assert status_code == 204
+    domain_count_mock.assert_called_once_with('testemail1@gmail.com', -1)
 
 
 def test_delete_contacts_nok_contact_not_found(monkeypatch):
@@ -195,6 +314,8 @@ def test_update_contact_ok(monkeypatch):
     monkeypatch.setattr('iqvia.contacts.views.does_contact_email_exist', Mock(return_value=False))
     monkeypatch.setattr('iqvia.contacts.views.Contact',
                         Mock(query=Mock(filter=Mock(return_value=Mock(first=Mock(return_value=contact))))))
+    domain_count_mock = Mock()
+    monkeypatch.setattr('iqvia.contacts.views.move_domain_count', domain_count_mock)
     status_code, response_data = post('contacts/7e8377af-bdc3-4b9e-a491-2d9ddff3253f', test_data)
 
     assert response_data == {'first_name': 'tesfirstnameUPDATED',
@@ -205,6 +326,7 @@ def test_update_contact_ok(monkeypatch):
 
     assert status_code == 200
     assert database_mock.call_count == 1
+    domain_count_mock.assert_called_once_with('testemail1@gmail.com', 'testemail2comUPDATED@gmail.com')
 
 
 def test_update_contact_nok_username_already_exists(monkeypatch):
@@ -0,0 +1,73 @@
+import threading
+from . import app, get
+from iqvia import admission
+from iqvia.admission import Limiter
+
+
+def test_limiter_admits_within_the_limit():
+    """
+    Testing the callers are admitted until the limit is reached and the slots are given back.
+    :return:
+    """
+    limiter = Limiter(2, 0, 0)
+
+    assert limiter.acquire() is True
+    assert limiter.acquire() is True
+    assert limiter.acquire() is False
+
+    limiter.release()
+    assert limiter.acquire() is True
+    assert limiter.stats() == {'limit': 2, 'active': 2, 'queue_size': 0, 'queue_depth': 0, 'admitted': 3, 'shed': 1}
+
+
+def test_limiter_sheds_after_queue_timeout():
+    """
+    Testing a queued caller is shed when no slot is released before the queue timeout.
+    :return:
+    """
+    limiter = Limiter(1, 1, 0.01)
+
+    assert limiter.acquire() is True
+    assert limiter.acquire() is False
+    assert limiter.stats()['queue_depth'] == 0
+    assert limiter.stats()['shed'] == 1
+
+
+def test_limiter_admits_queued_caller_after_release():
+    """
+    Testing a queued caller is admitted once a slot is released.
+    :return:
+    """
+    limiter = Limiter(1, 1, 5)
+    results = []
+
+    assert limiter.acquire() is True
+    waiter = threading.Thread(target=lambda: results.append(limiter.acquire()))
+    waiter.start()
+    while not limiter.stats()['queue_depth']:
+        waiter.join(0.001)
+
+    limiter.release()
+    waiter.join()
+
+    assert results == [True]
+    assert limiter.stats() == {'limit': 1, 'active': 1, 'queue_size': 1, 'queue_depth': 0, 'admitted': 2, 'shed': 0}
+
+
+def test_view_over_budget_returns_503(monkeypatch):
+    """
+    Testing a request over its budget gets a 503 with a Retry-After header.
+    :param monkeypatch: a monkeypatching instance.
+    :return:
+    """
+    monkeypatch.setitem(admission.limiters, 'read', Limiter(0, 0, 0))
+
+    response = app.test_client().get('contacts/')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '2'
+    assert response.get_json() == {'errors': [{'message': 'Sorry, the server is too busy to handle your request, '
+                                                          'please retry later'}]}
+    status_code, response_data = get('admission')
+    assert status_code == 200
+    assert response_data['read']['shed'] == 1